@@ -1,15 +1,42 @@
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QPushButton, QFileDialog, QInputDialog, QMessageBox
+    QApplication, QWidget, QVBoxLayout, QPushButton, QFileDialog, QInputDialog, QMessageBox,
+    QPlainTextEdit
 )
 import sys
 from main import FileManager  # Assumes your FileManager class is in main.py
 
+class OperationWorker(QObject):
+    """Runs a single FileManager operation off the UI thread"""
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, operation, *args, **kwargs):
+        super().__init__()
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.operation(*self.args, **self.kwargs)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
 class FileManagerGUI(QWidget):
+    # Report lines are emitted from the worker thread and queued to the UI
+    report_line = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
-        self.manager = FileManager()
+        self.manager = FileManager(report_callback=self.report_line.emit, verbose=False)
+        self.worker_thread = None
+        self.worker = None
+        self.busy = False
         self.setWindowTitle("File Management Automation Tool")
-        self.setGeometry(100, 100, 400, 200)
+        self.setGeometry(100, 100, 600, 450)
         layout = QVBoxLayout()
 
         self.rename_btn = QPushButton("Bulk Rename Files")
@@ -28,8 +55,50 @@ class FileManagerGUI(QWidget):
         self.remove_dup_btn.clicked.connect(self.remove_duplicates)
         layout.addWidget(self.remove_dup_btn)
 
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        layout.addWidget(self.output)
+        self.report_line.connect(self.output.appendPlainText)
+
         self.setLayout(layout)
 
+    def set_busy(self, busy):
+        self.busy = busy
+        for button in (self.rename_btn, self.sort_btn, self.dup_btn, self.remove_dup_btn):
+            button.setEnabled(not busy)
+
+    def run_in_background(self, operation, *args, **kwargs):
+        self.output.clear()
+        self.set_busy(True)
+
+        self.worker_thread = QThread()
+        self.worker = OperationWorker(operation, *args, **kwargs)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.failed.connect(self.show_error)
+        self.worker.finished.connect(self.worker_thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.worker_thread.finished.connect(self.worker_thread.deleteLater)
+        self.worker_thread.finished.connect(self.operation_finished)
+        self.worker_thread.start()
+
+    def closeEvent(self, event):
+        # Destroying a running QThread aborts the process, possibly mid-deletion
+        if self.busy:
+            QMessageBox.information(
+                self, "Operation Running",
+                "Please wait for the current operation to finish before closing."
+            )
+            event.ignore()
+        else:
+            event.accept()
+
+    def show_error(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+    def operation_finished(self):
+        self.set_busy(False)
+
     def bulk_rename(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
         if not directory:
@@ -41,22 +110,19 @@ class FileManagerGUI(QWidget):
         if not ok2:
             return
         use_regex, ok3 = QInputDialog.getItem(self, "Regex", "Use regex matching?", ["No", "Yes"], 0, False)
-        self.manager.bulk_rename(directory, pattern, replacement, use_regex == "Yes")
-        QMessageBox.information(self, "Bulk Rename", "\n".join(self.manager.report))
+        self.run_in_background(self.manager.bulk_rename, directory, pattern, replacement, use_regex == "Yes")
 
     def sort_files(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
         if not directory:
             return
-        self.manager.sort_files(directory)
-        QMessageBox.information(self, "Sort Files", "\n".join(self.manager.report))
+        self.run_in_background(self.manager.sort_files, directory)
 
     def find_duplicates(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
         if not directory:
             return
-        self.manager.find_duplicates(directory, remove_duplicates=False)
-        QMessageBox.information(self, "Find Duplicates", "\n".join(self.manager.report))
+        self.run_in_background(self.manager.find_duplicates, directory, remove_duplicates=False)
 
     def remove_duplicates(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Directory")
@@ -68,11 +134,10 @@ class FileManagerGUI(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            self.manager.find_duplicates(directory, remove_duplicates=True)
-            QMessageBox.information(self, "Remove Duplicates", "\n".join(self.manager.report))
+            self.run_in_background(self.manager.find_duplicates, directory, remove_duplicates=True)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = FileManagerGUI()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -7,15 +7,199 @@ Cross-platform file organizer with bulk renaming, sorting, and duplicate detecti
 import os
 import shutil
 import hashlib
+import mmap
 import re
+import queue
+import sqlite3
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
+import threading
 
-class FileManager:
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+
+HASH_ALGORITHM = 'xxh3_128' if xxhash is not None else 'blake2b-128'
+
+
+def _new_hasher():
+    """Return a fresh hasher for duplicate detection (xxh3-128 if available, else BLAKE2b)"""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _fadvise(f, advice_name):
+    """Apply the named posix_fadvise advice to a whole open file, where supported"""
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice_name))
+
+
+class DisjointSet:
+    """Union-find over hashable items, with path compression and union by rank"""
+    
     def __init__(self):
+        self.parent = {}
+        self.rank = {}
+    
+    def find(self, item):
+        """Return the representative of item's set, adding item if unseen"""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+            return item
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+    
+    def union(self, a, b):
+        """Merge the sets containing a and b"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+    
+    def groups(self):
+        """Return the members of every set as lists"""
+        members = defaultdict(list)
+        for item in self.parent:
+            members[self.find(item)].append(item)
+        return list(members.values())
+
+
+class DigestCache:
+    """
+    On-disk cache of file digests keyed by path
+    
+    A cached digest is only reused when the file's signature (size,
+    st_mtime_ns, st_ctime_ns, st_ino) is unchanged, so rewritten or
+    replaced files miss the cache even if their mtime was preserved.
+    Paths are stored as their filesystem bytes, so names that are not
+    valid UTF-8 are cached like any other.
+    
+    Any failure to open the database disables the cache instead of
+    failing the operation and is kept in self.error; a db_path of None
+    disables it outright. Later lookup or write errors are kept the same
+    way and treated as cache misses.
+    """
+    
+    def __init__(self, db_path):
+        self.conn = None
+        self.error = None
+        if db_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.conn = sqlite3.connect(db_path)
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS file_digests ("
+                    "path BLOB PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ctime_ns INTEGER, "
+                    "inode INTEGER, digest BLOB, algorithm TEXT)"
+                )
+                self.conn.execute(
+                    "CREATE INDEX IF NOT EXISTS file_digests_size_digest ON file_digests (size, digest)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            self.error = e
+            self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Close the database connection"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+    
+    @staticmethod
+    def signature(st):
+        """Return the (size, mtime_ns, ctime_ns, inode) tuple a cached digest is validated against"""
+        return (st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino)
+    
+    def get(self, path, signature):
+        """Return the cached hex digest for an unchanged file, or None"""
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT digest FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ? "
+                "AND ctime_ns = ? AND inode = ? AND algorithm = ?",
+                (os.fsencode(path), *signature, HASH_ALGORITHM)
+            ).fetchone()
+        except (sqlite3.Error, UnicodeError) as e:
+            self.error = e
+            return None
+        return row[0].hex() if row else None
+    
+    def put_many(self, rows):
+        """Store (path, signature, hex digest) rows in a single transaction"""
+        if self.conn is None or not rows:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO file_digests "
+                    "(path, size, mtime_ns, ctime_ns, inode, digest, algorithm) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(os.fsencode(path), *signature, bytes.fromhex(digest), HASH_ALGORITHM)
+                     for path, signature, digest in rows]
+                )
+        except (sqlite3.Error, UnicodeError) as e:
+            self.error = e
+    
+    def invalidate(self, paths):
+        """Forget cached digests for paths that were moved or removed"""
+        if self.conn is None or not paths:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "DELETE FROM file_digests WHERE path = ?", [(os.fsencode(path),) for path in paths]
+                )
+        except (sqlite3.Error, UnicodeError) as e:
+            self.error = e
+
+
+class FileManager:
+    # Bytes read for the cheap partial-hash pass in find_duplicates
+    HEAD_BLOCK_SIZE = 65536
+    # Maximum statx requests in flight on the optional io_uring scan backend
+    IO_URING_QUEUE_DEPTH = 256
+    # Files at least this large are hashed through mmap instead of a read loop
+    MMAP_MIN_SIZE = 1 << 20
+    # Head-hash ties up to this size are byte-compared instead of fully hashed
+    MAX_COMPARE_GROUP = 3
+    # Files at least this large are dropped from the page cache after hashing
+    FADVISE_DONTNEED_SIZE = 16 << 20
+    
+    def __init__(self, report_callback=None, verbose=False):
         self.report = []
+        # Echo report lines to stdout as they are added (CLI use)
+        self.verbose = verbose
+        # When set, report lines are streamed to this callable instead of
+        # being accumulated in self.report
+        self.report_callback = report_callback
         self.file_categories = {
             'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp', '.ico'],
             'Videos': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm'],
@@ -26,6 +210,12 @@ class FileManager:
             'Executables': ['.exe', '.msi', '.app', '.dmg', '.deb', '.rpm'],
             'Others': []
         }
+        self._ext_to_category = {
+            ext: cat for cat, exts in self.file_categories.items() for ext in exts
+        }
+        self.digest_cache_path = os.path.join(
+            os.path.expanduser('~'), '.cache', 'file_manager', 'hashes.sqlite'
+        )
     
     def clear_report(self):
         """Clear the current report"""
@@ -33,11 +223,18 @@ class FileManager:
     
     def add_to_report(self, message):
         """Add a message to the report"""
-        self.report.append(message)
-        print(message)
+        if self.report_callback is not None:
+            self.report_callback(message)
+        else:
+            self.report.append(message)
+        if self.verbose:
+            print(message)
     
     def print_report(self):
         """Print the full operation report"""
+        if self.report_callback is not None:
+            # Streamed lines were already delivered as they were added
+            return
         print("\n" + "="*60)
         print("OPERATION REPORT")
         print("="*60)
@@ -45,21 +242,362 @@ class FileManager:
             print(line)
         print("="*60 + "\n")
     
-    def get_file_hash(self, filepath, block_size=65536):
-        """Calculate MD5 hash of a file"""
-        hasher = hashlib.md5()
+    def get_file_digest(self, filepath, file_size=None, block_size=1 << 20, head_state=None):
+        """
+        Calculate content digest of a file
+        
+        head_state, a hasher from get_file_head_state, resumes hashing after
+        the first HEAD_BLOCK_SIZE bytes instead of reading them again.
+        """
+        if head_state is not None:
+            hasher = head_state.copy()
+            offset = self.HEAD_BLOCK_SIZE
+        else:
+            hasher = _new_hasher()
+            offset = 0
         try:
             with open(filepath, 'rb') as f:
-                while True:
-                    data = f.read(block_size)
-                    if not data:
-                        break
+                if file_size is None:
+                    file_size = os.fstat(f.fileno()).st_size
+                if file_size <= block_size and head_state is None:
+                    # Small files: a single sized read, no loop or trailing EOF
+                    # read; one extra byte detects a file that grew since the scan
+                    data = f.read(file_size + 1)
                     hasher.update(data)
+                    if len(data) <= file_size:
+                        return hasher.hexdigest()
+                    # Grown files are hashed on to EOF like large ones
+                    offset = len(data)
+                    file_size = os.fstat(f.fileno()).st_size
+                _fadvise(f, 'POSIX_FADV_SEQUENTIAL')
+                if file_size >= self.MMAP_MIN_SIZE:
+                    # Let the hash's C code stream through the whole mapping
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        view = memoryview(mm)
+                        try:
+                            hasher.update(view[offset:])
+                        finally:
+                            # The mapping cannot close while a view is exported
+                            view.release()
+                else:
+                    f.seek(offset)
+                    while True:
+                        data = f.read(block_size)
+                        if not data:
+                            break
+                        hasher.update(data)
+                if file_size >= self.FADVISE_DONTNEED_SIZE:
+                    # Don't let one-off reads of big files evict the hot page cache
+                    _fadvise(f, 'POSIX_FADV_DONTNEED')
             return hasher.hexdigest()
         except Exception as e:
             print(f"Error hashing {filepath}: {e}")
             return None
     
+    def get_file_head_state(self, filepath, n=HEAD_BLOCK_SIZE):
+        """Hash the first n bytes of a file and return the hasher, so a full digest can resume from it"""
+        hasher = _new_hasher()
+        try:
+            with open(filepath, 'rb') as f:
+                hasher.update(f.read(n))
+            return hasher
+        except Exception as e:
+            print(f"Error hashing {filepath}: {e}")
+            return None
+    
+    def _compare_files(self, path_a, path_b, block_size=1 << 20):
+        """
+        Byte-compare two files, stopping at the first differing block
+        
+        Identical files are hashed along the way, so their shared digest is
+        returned; None means they differ.
+        """
+        hasher = _new_hasher()
+        with open(path_a, 'rb') as fa, open(path_b, 'rb') as fb:
+            for f in (fa, fb):
+                _fadvise(f, 'POSIX_FADV_SEQUENTIAL')
+            try:
+                while True:
+                    data_a = fa.read(block_size)
+                    data_b = fb.read(block_size)
+                    if data_a != data_b:
+                        return None
+                    if not data_a:
+                        return hasher.hexdigest()
+                    hasher.update(data_a)
+            finally:
+                # Same page-cache protection as get_file_digest
+                for f in (fa, fb):
+                    if os.fstat(f.fileno()).st_size >= self.FADVISE_DONTNEED_SIZE:
+                        _fadvise(f, 'POSIX_FADV_DONTNEED')
+    
+    def _compare_group(self, group, cached_digests):
+        """
+        Find byte-identical files in a small group of DirEntry objects
+        
+        Two files that both have a digest in cached_digests (keyed by entry
+        path) are compared by digest; otherwise their bytes are compared.
+        Returns (path, path) match pairs, a {path: digest} dict for files
+        whose digest was computed by a byte compare, and the set of paths
+        that were actually read.
+        """
+        # Equality is transitive, so each file is compared against one
+        # representative per distinct content seen so far
+        representatives = []
+        matches = []
+        new_digests = {}
+        read_paths = set()
+        for entry in group:
+            for representative in representatives:
+                if representative in cached_digests and entry.path in cached_digests:
+                    same = cached_digests[representative] == cached_digests[entry.path]
+                else:
+                    read_paths.update((representative, entry.path))
+                    try:
+                        digest = self._compare_files(representative, entry.path)
+                    except OSError as e:
+                        print(f"Error comparing {entry.path}: {e}")
+                        digest = None
+                    same = digest is not None
+                    if same:
+                        new_digests[representative] = new_digests[entry.path] = digest
+                if same:
+                    matches.append((representative, entry.path))
+                    break
+            else:
+                representatives.append(entry.path)
+        return matches, new_digests, read_paths
+    
+    def _lookup_digest(self, cache, entry):
+        """Return (absolute path, signature, cached digest or None) for a DirEntry, or None if it cannot be stat'ed"""
+        try:
+            signature = DigestCache.signature(entry.stat(follow_symlinks=False))
+        except OSError:
+            return None
+        path = os.path.abspath(entry.path)
+        return path, signature, cache.get(path, signature)
+    
+    def _digest_candidates(self, executor, cache, candidates, head_states):
+        """
+        Return full digests for (size, entry) pairs
+        
+        Unchanged files are served from the digest cache; files with a saved
+        head hasher in head_states (keyed by entry path) resume from it.
+        Returns the digests and how many of them came from the cache.
+        """
+        digests = [None] * len(candidates)
+        misses = []
+        for i, (file_size, entry) in enumerate(candidates):
+            lookup = self._lookup_digest(cache, entry)
+            if lookup is None:
+                continue
+            path, signature, digests[i] = lookup
+            if digests[i] is None:
+                misses.append((i, path, file_size, signature))
+        
+        results = executor.map(
+            lambda path, file_size, head_state: self.get_file_digest(path, file_size, head_state=head_state),
+            [path for _, path, _, _ in misses],
+            [file_size for _, _, file_size, _ in misses],
+            [head_states.get(candidates[i][1].path) for i, _, _, _ in misses],
+        )
+        new_rows = []
+        for (i, path, file_size, signature), digest in zip(misses, results):
+            if digest:
+                digests[i] = digest
+                new_rows.append((path, signature, digest))
+        cache.put_many(new_rows)
+        cached_count = len(candidates) - len(misses) - digests.count(None)
+        return digests, cached_count
+    
+    def _open_digest_cache(self):
+        """Open the digest cache, reporting why if it has to be disabled"""
+        cache = DigestCache(self.digest_cache_path)
+        if cache.error is not None:
+            self.add_to_report(f"Digest cache disabled: {cache.error}")
+        return cache
+    
+    def _invalidate_digests(self, paths):
+        """Drop cached digests for paths that no longer hold the same file"""
+        if paths:
+            with self._open_digest_cache() as cache:
+                cache.invalidate([os.path.abspath(path) for path in paths])
+    
+    def _default_io_workers(self, directory):
+        """Pick a hashing thread count: 2 on spinning disks, up to 8 otherwise"""
+        if sys.platform.startswith('linux'):
+            try:
+                dev = os.stat(directory).st_dev
+                sys_dev = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+                # Partitions keep the queue settings on their parent device
+                for block_dir in (sys_dev, os.path.join(sys_dev, '..')):
+                    rotational = os.path.join(block_dir, 'queue', 'rotational')
+                    if os.path.exists(rotational):
+                        with open(rotational) as f:
+                            if f.read().strip() == '1':
+                                return 2
+                        break
+            except OSError:
+                pass
+        return min(8, os.cpu_count() or 1)
+    
+    def _scandir_files(self, root, workers=None):
+        """
+        Yield DirEntry objects for regular files under root
+        
+        Directories are listed by a pool of worker threads; each finished
+        directory's files are handed back to the calling thread in one batch.
+        """
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        
+        dir_queue = queue.Queue()
+        results = queue.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def walk():
+            while True:
+                directory = dir_queue.get()
+                try:
+                    if directory is None:
+                        return
+                    if stop.is_set():
+                        continue
+                    files = []
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_symlink():
+                                continue
+                            if entry.is_file(follow_symlinks=False):
+                                files.append(entry)
+                            elif entry.is_dir(follow_symlinks=False) and not stop.is_set():
+                                dir_queue.put(entry.path)
+                    results.put(files)
+                except OSError:
+                    # Skip unreadable or vanished subtrees
+                    pass
+                finally:
+                    dir_queue.task_done()
+        
+        def wait_for_walkers():
+            dir_queue.join()
+            results.put(done)
+        
+        dir_queue.put(root)
+        threads = [threading.Thread(target=walk, daemon=True) for _ in range(workers)]
+        threads.append(threading.Thread(target=wait_for_walkers, daemon=True))
+        for thread in threads:
+            thread.start()
+        
+        def drain():
+            while True:
+                try:
+                    dir_queue.get_nowait()
+                except queue.Empty:
+                    return
+                dir_queue.task_done()
+        
+        try:
+            while True:
+                files = results.get()
+                if files is done:
+                    break
+                yield from files
+        finally:
+            # Also reached when the consumer stops early: stop new work, drop
+            # queued directories, then shut the walkers down and wait for them
+            stop.set()
+            drain()
+            for _ in range(workers):
+                dir_queue.put(None)
+            for thread in threads[:workers]:
+                thread.join()
+            # A walker mid-scandir may have queued a directory after the drain
+            drain()
+            threads[-1].join()
+    
+    def _use_io_uring(self):
+        """Check whether the io_uring stat backend is available and enabled"""
+        return (
+            liburing is not None
+            and sys.platform == 'linux'
+            and os.environ.get('FM_USE_IO_URING') == '1'
+        )
+    
+    def _entry_stat(self, entry):
+        """Return (size, (st_dev, st_ino)) for a DirEntry; the key is None where inodes are unavailable"""
+        st = entry.stat(follow_symlinks=False)
+        # Windows leaves the cached inode fields zeroed
+        inode_key = (st.st_dev, st.st_ino) if st.st_ino else None
+        return st.st_size, inode_key
+    
+    def _iter_file_stats(self, entries):
+        """
+        Yield (entry, size, inode key) tuples for DirEntry objects
+        
+        With FM_USE_IO_URING=1 on Linux and the liburing package installed,
+        stat calls are batched through io_uring; otherwise (or if the ring
+        cannot be set up) each entry is stat'ed individually.
+        """
+        ring = None
+        if self._use_io_uring():
+            ring = liburing.Ring()
+            try:
+                liburing.io_uring_queue_init(self.IO_URING_QUEUE_DEPTH, ring)
+            except OSError:
+                ring = None
+        
+        if ring is None:
+            for entry in entries:
+                try:
+                    yield (entry, *self._entry_stat(entry))
+                except OSError:
+                    continue
+            return
+        
+        try:
+            cqe = liburing.Cqe()
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) == self.IO_URING_QUEUE_DEPTH:
+                    yield from self._statx_batch(ring, cqe, batch)
+                    batch = []
+            if batch:
+                yield from self._statx_batch(ring, cqe, batch)
+        finally:
+            liburing.io_uring_queue_exit(ring)
+    
+    def _statx_batch(self, ring, cqe, batch):
+        """Stat a batch of DirEntry objects with one io_uring submission"""
+        results = [liburing.Statx() for _ in batch]
+        for entry, statx in zip(batch, results):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_statx(
+                sqe, statx, entry.path, liburing.AT_SYMLINK_NOFOLLOW,
+                liburing.STATX_SIZE | liburing.STATX_INO
+            )
+        liburing.io_uring_submit(ring)
+        for _ in batch:
+            liburing.io_uring_wait_cqe(ring, cqe)
+            liburing.io_uring_cq_advance(ring, 1)
+        
+        for entry, statx in zip(batch, results):
+            if statx.mask & liburing.STATX_SIZE:
+                inode_key = None
+                if statx.mask & liburing.STATX_INO:
+                    inode_key = (os.makedev(statx.dev_major, statx.dev_minor), statx.ino)
+                yield entry, statx.size, inode_key
+            else:
+                # Request failed (e.g. file vanished); retry the plain way
+                try:
+                    yield (entry, *self._entry_stat(entry))
+                except OSError:
+                    continue
+    
     def bulk_rename(self, directory, pattern, replacement, use_regex=False):
         """
         Bulk rename files in a directory
@@ -82,36 +620,46 @@ class FileManager:
         
         renamed_count = 0
         error_count = 0
+        renamed_paths = []
         
         try:
-            for item in path.iterdir():
-                if item.is_file():
-                    old_name = item.name
+            regex = re.compile(pattern) if use_regex else None
+            
+            # Snapshot the listing so renamed files are not visited twice
+            with os.scandir(directory) as it:
+                entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+            
+            for entry in entries:
+                old_name = entry.name
+                
+                if regex is not None:
+                    new_name = regex.sub(replacement, old_name)
+                elif pattern in old_name:
+                    new_name = old_name.replace(pattern, replacement)
+                else:
+                    continue
+                
+                if new_name != old_name:
+                    new_path = os.path.join(directory, new_name)
                     
-                    if use_regex:
-                        new_name = re.sub(pattern, replacement, old_name)
-                    else:
-                        new_name = old_name.replace(pattern, replacement)
+                    if os.path.exists(new_path):
+                        self.add_to_report(f"⚠ Skipped '{old_name}': Target name already exists")
+                        error_count += 1
+                        continue
                     
-                    if new_name != old_name:
-                        new_path = item.parent / new_name
-                        
-                        if new_path.exists():
-                            self.add_to_report(f"⚠ Skipped '{old_name}': Target name already exists")
-                            error_count += 1
-                            continue
-                        
-                        try:
-                            item.rename(new_path)
-                            self.add_to_report(f"✓ Renamed: '{old_name}' -> '{new_name}'")
-                            renamed_count += 1
-                        except Exception as e:
-                            self.add_to_report(f"✗ Error renaming '{old_name}': {e}")
-                            error_count += 1
+                    try:
+                        os.rename(entry.path, new_path)
+                        self.add_to_report(f"✓ Renamed: '{old_name}' -> '{new_name}'")
+                        renamed_count += 1
+                        renamed_paths.append(entry.path)
+                    except Exception as e:
+                        self.add_to_report(f"✗ Error renaming '{old_name}': {e}")
+                        error_count += 1
         
         except Exception as e:
             self.add_to_report(f"Error during bulk rename: {e}")
         
+        self._invalidate_digests(renamed_paths)
         self.add_to_report(f"\nSummary: {renamed_count} files renamed, {error_count} errors")
         self.print_report()
     
@@ -133,50 +681,65 @@ class FileManager:
         
         moved_files = defaultdict(int)
         error_count = 0
+        moved_paths = []
+        category_dirs = {}
         
         try:
-            for item in path.iterdir():
-                if item.is_file():
-                    ext = item.suffix.lower()
-                    category = 'Others'
-                    
-                    # Determine category
-                    for cat, extensions in self.file_categories.items():
-                        if ext in extensions:
-                            category = cat
-                            break
-                    
-                    # Create category folder if needed
-                    if create_subdirs:
+            source_dev = os.stat(source_directory).st_dev
+            with os.scandir(source_directory) as it:
+                entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+            
+            for entry in entries:
+                name_stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                category = self._ext_to_category.get(ext, 'Others')
+                
+                # Create category folder if needed
+                if create_subdirs:
+                    if category not in category_dirs:
                         category_path = path / category
                         category_path.mkdir(exist_ok=True)
-                    else:
-                        category_path = path
-                    
-                    # Move file
-                    destination = category_path / item.name
-                    
-                    # Handle name conflicts
-                    if destination.exists() and destination != item:
-                        name_stem = item.stem
-                        counter = 1
-                        while destination.exists():
-                            new_name = f"{name_stem}_{counter}{ext}"
-                            destination = category_path / new_name
-                            counter += 1
-                    
-                    try:
-                        if destination != item:  # Only move if not already in place
-                            shutil.move(str(item), str(destination))
-                            self.add_to_report(f"✓ Moved '{item.name}' to {category}/")
-                            moved_files[category] += 1
-                    except Exception as e:
-                        self.add_to_report(f"✗ Error moving '{item.name}': {e}")
-                        error_count += 1
+                        # A category folder can only differ in device if something is mounted on it
+                        same_device = category_path.stat().st_dev == source_dev
+                        # Names are compared casefolded so case-insensitive
+                        # filesystems never get an existing file overwritten
+                        with os.scandir(category_path) as it:
+                            existing_names = {e.name.casefold() for e in it}
+                        category_dirs[category] = (str(category_path), same_device, existing_names)
+                    category_dir, same_device, existing_names = category_dirs[category]
+                else:
+                    category_dir, same_device, existing_names = source_directory, True, None
+                
+                # Move file
+                destination = os.path.join(category_dir, entry.name)
+                
+                # Handle name conflicts
+                new_name = entry.name
+                if destination != entry.path:
+                    counter = 1
+                    while new_name.casefold() in existing_names:
+                        new_name = f"{name_stem}_{counter}{ext}"
+                        counter += 1
+                    destination = os.path.join(category_dir, new_name)
+                
+                try:
+                    if destination != entry.path:  # Only move if not already in place
+                        if same_device:
+                            os.replace(entry.path, destination)
+                        else:
+                            shutil.move(entry.path, destination)
+                        existing_names.add(new_name.casefold())
+                        self.add_to_report(f"✓ Moved '{entry.name}' to {category}/")
+                        moved_files[category] += 1
+                        moved_paths.append(entry.path)
+                except Exception as e:
+                    self.add_to_report(f"✗ Error moving '{entry.name}': {e}")
+                    error_count += 1
         
         except Exception as e:
             self.add_to_report(f"Error during file sorting: {e}")
         
+        self._invalidate_digests(moved_paths)
         self.add_to_report("\nCategory Summary:")
         total_moved = 0
         for category, count in sorted(moved_files.items()):
@@ -186,13 +749,14 @@ class FileManager:
         self.add_to_report(f"\nTotal: {total_moved} files organized, {error_count} errors")
         self.print_report()
     
-    def find_duplicates(self, directory, remove_duplicates=False):
+    def find_duplicates(self, directory, remove_duplicates=False, io_workers=None):
         """
         Find and optionally remove duplicate files using hash comparison
         
         Args:
             directory: Path to directory to scan
             remove_duplicates: If True, remove duplicate files
+            io_workers: Number of hashing threads (default: based on storage type)
         """
         self.clear_report()
         self.add_to_report(f"Scanning for duplicates in: {directory}")
@@ -203,33 +767,158 @@ class FileManager:
             self.add_to_report(f"Error: Directory '{directory}' does not exist!")
             return
         
-        # Dictionary to store hash -> list of file paths
-        hash_map = defaultdict(list)
+        # Dictionary to store size -> list of file entries
+        size_map = defaultdict(list)
+        # Dictionary to store (size, hash) -> first file path with that digest
+        hash_map = {}
+        # Confirmed duplicates from byte compares and full hashes, plus their sizes
+        duplicate_sets = DisjointSet()
+        file_sizes = {}
         scanned_count = 0
+        hashed_count = 0
+        # Files whose digest came from the cache instead of being read
+        cached_count = 0
+        # (st_dev, st_ino) -> [(entry, size)], and stand-in path -> its other hard links
+        inode_entries = defaultdict(list)
+        hardlink_aliases = {}
         
-        # Scan all files recursively
-        self.add_to_report("Calculating file hashes...")
+        # Scan all files recursively, bucketing by size
         try:
-            for item in path.rglob('*'):
-                if item.is_file():
-                    file_hash = self.get_file_hash(item)
-                    if file_hash:
-                        hash_map[file_hash].append(item)
-                        scanned_count += 1
-                        if scanned_count % 50 == 0:
-                            print(f"  Scanned {scanned_count} files...", end='\r')
+            for entry, file_size, inode_key in self._iter_file_stats(self._scandir_files(directory)):
+                scanned_count += 1
+                if inode_key is not None:
+                    inode_entries[inode_key].append((entry, file_size))
+                else:
+                    size_map[file_size].append(entry)
+                if self.verbose and scanned_count & 0x3FF == 0:
+                    print(f"  Scanned {scanned_count} files...", end='\r')
         
         except Exception as e:
             self.add_to_report(f"Error during scanning: {e}")
         
-        print()  # New line after progress
-        self.add_to_report(f"Scanned {scanned_count} files\n")
+        if self.verbose:
+            print()  # New line after progress
+        self.add_to_report(f"Scanned {scanned_count} files")
+        
+        # Hard links share one inode, so only one path per inode is hashed.
+        # The lowest path stands in for it, independent of scan order.
+        for linked in inode_entries.values():
+            linked.sort(key=lambda item: item[0].path)
+            entry, file_size = linked[0]
+            size_map[file_size].append(entry)
+            if len(linked) > 1:
+                hardlink_aliases[entry.path] = [alias.path for alias, _ in linked[1:]]
+        inode_entries = None
+        
+        # Only files sharing a size with another file can be duplicates
+        size_groups = {size: group for size, group in size_map.items() if len(group) > 1}
+        eligible_count = sum(len(group) for group in size_groups.values())
+        
+        if io_workers is None:
+            io_workers = self._default_io_workers(directory)
+        
+        with self._open_digest_cache() as cache, ThreadPoolExecutor(max_workers=io_workers) as executor:
+            # Split large size groups by a hash of their first block; files
+            # no larger than the block go straight to the full hash
+            candidate_groups = []
+            head_candidates = []
+            for file_size, group in size_groups.items():
+                if file_size <= self.HEAD_BLOCK_SIZE:
+                    candidate_groups.append((file_size, group))
+                else:
+                    head_candidates.extend((file_size, entry) for entry in group)
+            
+            head_map = defaultdict(list)
+            head_states = {}
+            head_hashed_count = 0
+            head_results = executor.map(self.get_file_head_state, [entry.path for _, entry in head_candidates])
+            for (file_size, entry), head_state in zip(head_candidates, head_results):
+                if head_state is not None:
+                    head_map[(file_size, head_state.hexdigest())].append(entry)
+                    head_states[entry.path] = head_state
+                    head_hashed_count += 1
+            
+            # Small head-hash ties are settled by a direct byte compare, which
+            # stops at the first difference; larger ones are fully hashed to
+            # avoid quadratic comparisons
+            compare_groups = []
+            # Full hashes of large ties resume from their saved head state
+            resume_states = {}
+            for (file_size, head_hash), group in head_map.items():
+                if len(group) > self.MAX_COMPARE_GROUP:
+                    candidate_groups.append((file_size, group))
+                    resume_states.update((entry.path, head_states[entry.path]) for entry in group)
+                elif len(group) > 1:
+                    compare_groups.append((file_size, group))
+            # Unique heads and compared ties never resume, so their hashers go now
+            del head_states
+            
+            # Previously hashed members are matched by cached digest, so
+            # unchanged pairs are not re-read on every run
+            compare_lookups = {}
+            cached_digests = {}
+            for _, group in compare_groups:
+                for entry in group:
+                    lookup = self._lookup_digest(cache, entry)
+                    if lookup is not None:
+                        compare_lookups[entry.path] = lookup
+                        if lookup[2] is not None:
+                            cached_digests[entry.path] = lookup[2]
+            
+            compared_count = 0
+            compared_matches = executor.map(
+                lambda group: self._compare_group(group, cached_digests),
+                [group for _, group in compare_groups],
+            )
+            new_rows = []
+            for (file_size, group), (matches, new_digests, read_paths) in zip(compare_groups, compared_matches):
+                compared_count += len(read_paths)
+                # Members settled purely by their cached digest were never read
+                cached_count += sum(
+                    1 for entry in group if entry.path in cached_digests and entry.path not in read_paths
+                )
+                for first_path, other_path in matches:
+                    duplicate_sets.union(first_path, other_path)
+                    file_sizes[first_path] = file_sizes[other_path] = file_size
+                # Cache digests of matched files so reruns skip the compare
+                for entry_path, digest in new_digests.items():
+                    if entry_path in compare_lookups and entry_path not in cached_digests:
+                        path, signature, _ = compare_lookups[entry_path]
+                        new_rows.append((path, signature, digest))
+            cache.put_many(new_rows)
+            
+            self.add_to_report("Calculating file hashes...")
+            candidates = [(file_size, entry) for file_size, group in candidate_groups for entry in group]
+            file_hashes, cache_hits = self._digest_candidates(executor, cache, candidates, resume_states)
+            cached_count += cache_hits
+            del resume_states
+            for (file_size, entry), file_hash in zip(candidates, file_hashes):
+                if file_hash:
+                    first_path = hash_map.setdefault((file_size, file_hash), entry.path)
+                    if first_path != entry.path:
+                        duplicate_sets.union(first_path, entry.path)
+                        file_sizes[first_path] = file_sizes[entry.path] = file_size
+            hashed_count = len(file_hashes) - file_hashes.count(None) - cache_hits
+        
+        self.add_to_report(
+            f"{eligible_count} files size-eligible, {head_hashed_count} head-hashed, "
+            f"{compared_count} byte-compared, {hashed_count} hashed, {cached_count} served from cache\n"
+        )
+        
+        if hardlink_aliases:
+            self.add_to_report(f"Hard-linked files ({len(hardlink_aliases)} sets, hashed once per set):")
+            for first_path, aliases in sorted(hardlink_aliases.items()):
+                self.add_to_report(f"  {first_path}")
+                for alias in aliases:
+                    self.add_to_report(f"    [HARDLINK] {alias}")
         
         # Find duplicates
         duplicates_found = []
-        for file_hash, files in hash_map.items():
-            if len(files) > 1:
-                duplicates_found.append(files)
+        for files in duplicate_sets.groups():
+            # Sorted so the kept file does not depend on scan order
+            files.sort()
+            duplicates_found.append((file_sizes[files[0]], files))
+        duplicates_found.sort(key=lambda group: group[1][0])
         
         if not duplicates_found:
             self.add_to_report("No duplicate files found!")
@@ -239,28 +928,44 @@ class FileManager:
         # Report and optionally remove duplicates
         removed_count = 0
         space_freed = 0
+        removed_paths = []
+        total_duplicates = 0
         
-        for dup_group in duplicates_found:
-            file_size = dup_group[0].stat().st_size
-            self.add_to_report(f"\nDuplicate group ({len(dup_group)} files, {file_size:,} bytes each):")
+        for file_size, dup_group in duplicates_found:
+            path_count = sum(1 + len(hardlink_aliases.get(p, ())) for p in dup_group)
+            self.add_to_report(f"\nDuplicate group ({path_count} files, {file_size:,} bytes each):")
             
-            # Keep the first file, remove others
-            for i, file_path in enumerate(dup_group):
-                if i == 0:
-                    self.add_to_report(f"  [KEEP] {file_path}")
-                else:
-                    if remove_duplicates:
+            # Keep a member that has hard links if there is one (deleting it
+            # would free nothing), otherwise the first file; remove others
+            keep = next((p for p in dup_group if p in hardlink_aliases), dup_group[0])
+            for file_path in [keep] + [p for p in dup_group if p != keep]:
+                links = [file_path] + hardlink_aliases.get(file_path, [])
+                if file_path == keep:
+                    for link in links:
+                        self.add_to_report(f"  [KEEP] {link}")
+                    continue
+                
+                total_duplicates += len(links)
+                if remove_duplicates:
+                    # The data is only freed once every hard link to it is gone
+                    all_removed = True
+                    for link in links:
                         try:
-                            file_path.unlink()
-                            self.add_to_report(f"  [REMOVED] {file_path}")
+                            os.remove(link)
+                            self.add_to_report(f"  [REMOVED] {link}")
                             removed_count += 1
-                            space_freed += file_size
+                            removed_paths.append(link)
                         except Exception as e:
-                            self.add_to_report(f"  [ERROR] Could not remove {file_path}: {e}")
-                    else:
-                        self.add_to_report(f"  [DUPLICATE] {file_path}")
+                            self.add_to_report(f"  [ERROR] Could not remove {link}: {e}")
+                            all_removed = False
+                    if all_removed:
+                        space_freed += file_size
+                else:
+                    for link in links:
+                        self.add_to_report(f"  [DUPLICATE] {link}")
+        
+        self._invalidate_digests(removed_paths)
         
-        total_duplicates = sum(len(group) - 1 for group in duplicates_found)
         self.add_to_report(f"\nSummary:")
         self.add_to_report(f"  Duplicate groups found: {len(duplicates_found)}")
         self.add_to_report(f"  Total duplicate files: {total_duplicates}")
@@ -288,7 +993,7 @@ def get_valid_directory():
 
 def main():
     """Main menu interface"""
-    manager = FileManager()
+    manager = FileManager(verbose=True)
     
     while True:
         clear_screen()
@@ -0,0 +1,216 @@
+import os
+import tempfile
+import unittest
+
+from main import FileManager
+
+
+CONTENT = b"duplicate content\n" * 100
+
+
+class FindDuplicatesHardLinkTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.manager = FileManager()
+        self.manager.digest_cache_path = None
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, relpath):
+        path = os.path.join(self.root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(CONTENT)
+        return path
+
+    def link(self, source, relpath):
+        path = os.path.join(self.root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.link(source, path)
+        return path
+
+    def remaining(self):
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, name), self.root)
+            for dirpath, _, names in os.walk(self.root)
+            for name in names
+        )
+
+    def report_lines(self, tag):
+        return [line.split(tag, 1)[1].strip() for line in self.manager.report if tag in line]
+
+    def test_copy_sorts_before_hard_links(self):
+        self.write('a/x')
+        linked = self.write('b/y')
+        self.link(linked, 'c/z')
+
+        self.manager.find_duplicates(self.root, remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['b/y', 'c/z'])
+        self.assertIn(f"  Space freed: {len(CONTENT):,} bytes (0.00 MB)", self.manager.report)
+
+    def test_copy_sorts_after_hard_links(self):
+        linked = self.write('a/y')
+        self.link(linked, 'b/z')
+        self.write('c/x')
+
+        self.manager.find_duplicates(self.root, remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['a/y', 'b/z'])
+        self.assertIn(f"  Space freed: {len(CONTENT):,} bytes (0.00 MB)", self.manager.report)
+
+    def test_removed_member_takes_its_hard_links_with_it(self):
+        kept = self.write('a/x')
+        self.link(kept, 'b/x')
+        removed = self.write('c/y')
+        self.link(removed, 'd/y')
+
+        self.manager.find_duplicates(self.root, remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['a/x', 'b/x'])
+        self.assertEqual(len(self.report_lines('[REMOVED]')), 2)
+        self.assertIn(f"  Space freed: {len(CONTENT):,} bytes (0.00 MB)", self.manager.report)
+
+    def test_stand_in_is_lowest_path(self):
+        linked = self.write('b/y')
+        self.link(linked, 'a/z')
+        self.write('c/x')
+
+        self.manager.find_duplicates(self.root, remove_duplicates=False)
+
+        keep = [os.path.relpath(p, self.root) for p in self.report_lines('[KEEP]')]
+        duplicates = [os.path.relpath(p, self.root) for p in self.report_lines('[DUPLICATE]')]
+        self.assertEqual(keep, ['a/z', 'b/y'])
+        self.assertEqual(duplicates, ['c/x'])
+
+
+
+class FindDuplicatesContentTests(unittest.TestCase):
+    """Byte compares and cached digests decide what remove_duplicates deletes"""
+
+    SIZE = FileManager.HEAD_BLOCK_SIZE + 4096
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, 'files')
+        os.mkdir(self.root)
+        self.cache_path = os.path.join(self._tmp.name, 'cache', 'hashes.sqlite')
+        self.base = bytes(range(256)) * (self.SIZE // 256)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def content(self, variant):
+        """Same-size content that only differs after the first HEAD_BLOCK_SIZE bytes"""
+        data = bytearray(self.base)
+        data[-1] = variant
+        return bytes(data)
+
+    def write(self, name, variant=0):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as f:
+            f.write(self.content(variant))
+        return path
+
+    def run_scan(self, remove_duplicates=False):
+        manager = FileManager()
+        manager.digest_cache_path = self.cache_path
+        manager.find_duplicates(self.root, remove_duplicates=remove_duplicates)
+        return manager
+
+    def remaining(self):
+        return sorted(os.listdir(self.root))
+
+    @staticmethod
+    def counts(manager):
+        line = next(line for line in manager.report if 'size-eligible' in line)
+        return line.strip()
+
+    def test_compare_group_of_two_differing_after_head(self):
+        self.write('a', 0)
+        self.write('b', 1)
+
+        self.run_scan(remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['a', 'b'])
+
+    def test_compare_group_of_three_differing_after_head(self):
+        self.write('a', 0)
+        self.write('b', 1)
+        self.write('c', 0)
+
+        self.run_scan(remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['a', 'b'])
+
+    def test_hashed_group_differing_after_head(self):
+        for name, variant in zip('abcde', (0, 1, 0, 2, 0)):
+            self.write(name, variant)
+
+        self.run_scan(remove_duplicates=True)
+
+        self.assertEqual(self.remaining(), ['a', 'b', 'd'])
+
+    def test_rerun_is_served_from_cache(self):
+        # A compare stops at the first difference, so only matching members
+        # of a compared group get a digest to cache
+        for name in 'abc':
+            self.write(name)
+        for name, variant in zip('defgh', (0, 1, 0, 2, 0)):
+            self.write(name + '.big', variant)
+            with open(os.path.join(self.root, name + '.big'), 'ab') as f:
+                f.write(b'big')
+
+        first = self.run_scan()
+        second = self.run_scan()
+
+        self.assertEqual(
+            self.counts(first),
+            "8 files size-eligible, 8 head-hashed, 3 byte-compared, 5 hashed, 0 served from cache"
+        )
+        self.assertEqual(
+            self.counts(second),
+            "8 files size-eligible, 8 head-hashed, 0 byte-compared, 0 hashed, 8 served from cache"
+        )
+        self.assertEqual(
+            [line for line in second.report if '[' in line],
+            [line for line in first.report if '[' in line]
+        )
+
+    def test_rewrite_with_preserved_mtime_misses_cache(self):
+        for names in (('a', 'b'), ('c', 'd', 'e', 'f')):
+            with self.subTest(names=names):
+                for name in os.listdir(self.root):
+                    os.remove(os.path.join(self.root, name))
+                paths = [self.write(name) for name in names]
+                self.run_scan()
+
+                # Same size, new content, old timestamps
+                st = os.stat(paths[-1])
+                with open(paths[-1], 'r+b') as f:
+                    f.write(self.content(1))
+                os.utime(paths[-1], ns=(st.st_atime_ns, st.st_mtime_ns))
+
+                self.run_scan(remove_duplicates=True)
+
+                self.assertEqual(self.remaining(), [names[0], names[-1]])
+
+    def test_non_utf8_filename(self):
+        try:
+            path = self.write(os.fsdecode(b'caf\xe9.bin'))
+        except (OSError, UnicodeError):
+            self.skipTest("filesystem does not accept non-UTF-8 names")
+        self.write('copy.bin')
+
+        self.run_scan()
+        second = self.run_scan(remove_duplicates=True)
+
+        self.assertIn("0 hashed, 2 served from cache", self.counts(second))
+        self.assertEqual(self.remaining(), [os.path.basename(path)])
+        self.assertIn(f"  [REMOVED] {os.path.join(self.root, 'copy.bin')}", second.report)
+
+
+if __name__ == '__main__':
+    unittest.main()